@@ -47,6 +47,8 @@ DEFAULT_SETTINGS = {
     "default_aspect_ratio": "16:9",
     "default_duration": "5s",
     "check_interval_seconds": 10,
+    "disable_dpi_scaling": False,
+    "quiet_log": False,
 }
 
 # Settings file path
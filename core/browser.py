@@ -235,6 +235,17 @@ class BrowserCore:
                 pass
         return False
     
+    def is_alive(self) -> bool:
+        """Kiểm tra browser còn mở và phản hồi hay không"""
+        if not self.driver:
+            return False
+        
+        try:
+            self.driver.window_handles
+            return True
+        except Exception:
+            return False
+    
     def close(self):
         """Đóng browser"""
         if self.driver:
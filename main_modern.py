@@ -0,0 +1,13 @@
+"""
+Sora Automation Tool - Entry Point (modern UI)
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ui.main_window_modern import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+@echo off
+echo ========================================
+echo   Running Sora Automation Tool (Modern UI)
+echo ========================================
+echo.
+
+REM Activate venv and run
+call venv\Scripts\activate.bat
+python main_modern.py
+
+pause
@@ -3,7 +3,7 @@ Google Sheets integration for reading prompts and writing status
 """
 import os
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from pathlib import Path
 
 try:
@@ -297,9 +297,11 @@ class ExcelService:
     def read_worksheet(
         self,
         worksheet_name: str = None,
-        skip_completed: bool = True
+        skip_completed: bool = True,
+        progress_callback: Callable[[int], None] = None,
+        progress_every: int = 100
     ) -> List[SheetRow]:
-        """Read all rows from worksheet"""
+        """Read all rows from worksheet, reporting the row count every progress_every rows"""
         if not self.workbook:
             self.log("❌ No workbook loaded")
             return []
@@ -394,6 +396,8 @@ class ExcelService:
                 # Skip empty prompts
                 if row.prompt.strip():
                     rows.append(row)
+                    if progress_callback and len(rows) % progress_every == 0:
+                        progress_callback(len(rows))
                     
             self.log(f"📊 Loaded {len(rows)} rows from Excel")
             return rows
@@ -413,13 +417,7 @@ class ExcelService:
             else:
                 ws = self.workbook.active
                 
-            # Find status column
-            headers = [cell.value for cell in ws[1]]
-            status_col = None
-            for i, h in enumerate(headers, start=1):
-                if str(h).upper() in ["STATUS", "TRẠNG THÁI"]:
-                    status_col = i
-                    break
+            status_col = self._find_status_column(ws)
                     
             if status_col:
                 ws.cell(row=row_index, column=status_col, value=status)
@@ -434,6 +432,40 @@ class ExcelService:
             self.log(f"❌ Failed to update status: {e}")
             return False
             
+    def update_statuses(self, updates: List[Tuple[int, str]], worksheet_name: str = None):
+        """Update status for many rows, saving the workbook only once"""
+        if not updates or not self.workbook or not self.filepath:
+            return False
+            
+        try:
+            if worksheet_name:
+                ws = self.workbook[worksheet_name]
+            else:
+                ws = self.workbook.active
+                
+            status_col = self._find_status_column(ws)
+            if not status_col:
+                self.log("⚠️ Status column not found")
+                return False
+                
+            for row_index, status in updates:
+                ws.cell(row=row_index, column=status_col, value=status)
+            self.workbook.save(self.filepath)
+            self.log(f"📝 Updated status for {len(updates)} rows")
+            return True
+            
+        except Exception as e:
+            self.log(f"❌ Failed to update statuses: {e}")
+            return False
+            
+    def _find_status_column(self, ws) -> Optional[int]:
+        """Find the 1-based index of the status column"""
+        headers = [cell.value for cell in ws[1]]
+        for i, h in enumerate(headers, start=1):
+            if str(h).upper() in ["STATUS", "TRẠNG THÁI"]:
+                return i
+        return None
+            
     def save(self):
         """Save changes to file"""
         if self.workbook and self.filepath:
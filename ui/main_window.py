@@ -5,11 +5,15 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext, simpledialog
 import threading
 import queue
+import collections
 import os
 import sys
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Callable
+from types import SimpleNamespace
+from typing import List, Dict, Callable, Optional
 
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -53,15 +57,25 @@ class SoraToolApp:
         self.settings = load_settings()
         self.profile_manager = ProfileManager()  # New ProfileManager
         self.profiles = load_profiles()  # Keep old profiles for compatibility
+        self._profile_names_cache: tuple = tuple(self.profiles)
         self.tasks: List[SheetRow] = []
         self.is_running = False
         self.thread_pool: ThreadPoolManager = None
         self.browser_instances: Dict[int, BrowserCore] = {}
         self.sora_instances: Dict[int, SoraAutomationService] = {}
         self.profile_assignments: Dict[int, str] = {}  # thread_id -> profile_name
+        self._defaults: SimpleNamespace = None  # Snapshot of default settings for the current run
+        self._is_excel_source = False  # Whether status updates go to the loaded Excel file
         
         # Message queue for thread-safe logging
         self.log_queue = queue.Queue()
+        self._log_mirror = collections.deque(maxlen=10000)  # Recent log lines, used by Save Logs
+        
+        # Pending Excel status updates, written in batches
+        self._status_buffer: List[tuple] = []  # (service, row_index, status)
+        self._status_lock = threading.Lock()
+        self._status_write_lock = threading.Lock()  # Serializes workbook saves
+        self._status_flush_id = None
         
         # Build UI
         self._apply_theme()
@@ -661,6 +675,7 @@ class SoraToolApp:
         
         # Also sync with old profiles dict for compatibility
         self.profiles = load_profiles()
+        self._profile_names_cache = tuple(self.profiles)
         
         # Update thread limit
         self._update_thread_limit()
@@ -761,37 +776,47 @@ class SoraToolApp:
         self._refresh_profiles()
         
         def check_all_thread():
-            import time
+            # Local aliases for the per-profile loop
+            base_url = SoraAutomationService.BASE_URL
+            pm = self.profile_manager
+            log = self._log
+            sleep = time.sleep
+            now = time.time
+            
             logged_in = 0
             not_logged_in = 0
             
             for profile in profiles:
                 profile_name = profile.name
-                self._log(f"🔍 Đang kiểm tra: {profile_name}")
+                log(f"🔍 Đang kiểm tra: {profile_name}")
                 
                 browser = None
                 try:
                     browser = BrowserCore(profile_name=profile_name, headless=True)
                     browser.init_browser()
-                    browser.navigate(SoraAutomationService.BASE_URL)
+                    browser.navigate(base_url)
                     
-                    time.sleep(3)
-                    
-                    sora = SoraAutomationService(browser, log_callback=self._log)
+                    # Chờ Sora render xong: poll dấu hiệu đăng nhập thay vì sleep cố định
+                    sora = SoraAutomationService(browser, log_callback=log)
+                    # Không lâu hơn sleep(3) cũ với profile chưa đăng nhập
+                    deadline = now() + 3
                     is_logged = sora.is_logged_in()
+                    while not is_logged and now() < deadline:
+                        sleep(0.5)
+                        is_logged = sora.is_logged_in()
                     
                     if is_logged:
-                        self.profile_manager.mark_as_logged_in(profile_name)
-                        self._log(f"✅ {profile_name}: Đã đăng nhập")
+                        pm.mark_as_logged_in(profile_name)
+                        log(f"✅ {profile_name}: Đã đăng nhập")
                         logged_in += 1
                     else:
-                        self.profile_manager.mark_as_not_logged_in(profile_name)
-                        self._log(f"❌ {profile_name}: Chưa đăng nhập")
+                        pm.mark_as_not_logged_in(profile_name)
+                        log(f"❌ {profile_name}: Chưa đăng nhập")
                         not_logged_in += 1
                     
                 except Exception as e:
-                    self._log(f"❌ {profile_name}: Lỗi - {e}")
-                    self.profile_manager.mark_as_not_logged_in(profile_name)
+                    log(f"❌ {profile_name}: Lỗi - {e}")
+                    pm.mark_as_not_logged_in(profile_name)
                     not_logged_in += 1
                 
                 finally:
@@ -829,24 +854,27 @@ class SoraToolApp:
         self._log(f"🌐 Đang mở browser cho profile: {name}")
         
         def login_thread():
+            base_url = SoraAutomationService.BASE_URL
+            pm = self.profile_manager
+            log = self._log
             try:
                 browser = BrowserCore(profile_name=name)
                 browser.init_browser()
-                browser.navigate(SoraAutomationService.BASE_URL)
-                self._log(f"🔐 Đã mở browser. Vui lòng đăng nhập thủ công.")
+                browser.navigate(base_url)
+                log(f"🔐 Đã mở browser. Vui lòng đăng nhập thủ công.")
                 
                 # Wait for user to login
-                sora = SoraAutomationService(browser, log_callback=self._log)
+                sora = SoraAutomationService(browser, log_callback=log)
                 if sora.wait_for_manual_login(timeout=300):
-                    self.profile_manager.mark_as_logged_in(name)
+                    pm.mark_as_logged_in(name)
                     self.root.after(0, self._refresh_profiles)
-                    self._log("✅ Đăng nhập thành công!")
+                    log("✅ Đăng nhập thành công!")
                     self.root.after(0, lambda: messagebox.showinfo("Thành công", "Đăng nhập thành công! Profile đã được lưu."))
                 else:
-                    self._log("⚠️ Hết thời gian chờ đăng nhập")
+                    log("⚠️ Hết thời gian chờ đăng nhập")
                     
             except Exception as e:
-                self._log(f"❌ Lỗi đăng nhập: {e}")
+                log(f"❌ Lỗi đăng nhập: {e}")
                 
         threading.Thread(target=login_thread, daemon=True).start()
         
@@ -876,21 +904,18 @@ class SoraToolApp:
         self.log_text.config(state="normal")
         self.log_text.delete("1.0", "end")
         self.log_text.config(state="disabled")
+        self._log_mirror.clear()
         
     def _save_logs(self):
         """Save logs to file"""
         filepath = filedialog.asksaveasfilename(
             title="Save Logs",
             defaultextension=".txt",
-            initialname=f"sora_logs_{int(__import__('time').time())}.txt"
+            initialfile=f"sora_logs_{int(time.time())}.txt"
         )
         if filepath:
-            self.log_text.config(state="normal")
-            content = self.log_text.get("1.0", "end")
-            self.log_text.config(state="disabled")
-            
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(content)
+            with open(filepath, "w", encoding="utf-8", buffering=1 << 16) as f:
+                f.writelines(m + "\n" for m in self._log_mirror)
             messagebox.showinfo("Success", f"Logs saved: {filepath}")
             
     # ==================== Execution Methods ====================
@@ -907,7 +932,7 @@ class SoraToolApp:
             return
         
         # Get available profiles
-        available_profiles = list(self.profiles.keys())
+        available_profiles = self._profile_names_cache
         num_profiles = len(available_profiles)
         
         # Limit threads to number of profiles
@@ -927,6 +952,19 @@ class SoraToolApp:
             return
             
         self._log(f"⚡ Yêu cầu: {requested_threads} threads | Có sẵn: {num_profiles} profiles | Thực tế: {actual_threads} threads")
+        
+        # Snapshot default values once so worker threads never touch Tk variables
+        self._defaults = SimpleNamespace(
+            type=self.default_type.get(),
+            aspect=self.default_aspect.get(),
+            duration=self.default_duration.get(),
+            resolution=self.default_resolution.get(),
+            variations=int(self.default_variations.get()),
+        )
+        self._is_excel_source = self.source_type.get() == "excel" and hasattr(self, "excel_service")
+        # Bound into this run's task callbacks, so late statuses from a stopped pool
+        # never land in a workbook loaded for a later run
+        status_service = self.excel_service if self._is_excel_source else None
             
         self.is_running = True
         self.start_btn.config(state="disabled")
@@ -937,28 +975,29 @@ class SoraToolApp:
         self.profile_assignments = {}
         for i in range(actual_threads):
             # Round-robin assignment: thread 1 -> profile 0, thread 2 -> profile 1, etc.
-            profile_idx = i % num_profiles
-            self.profile_assignments[i + 1] = available_profiles[profile_idx]
+            self.profile_assignments[i + 1] = available_profiles[i % num_profiles]
         
         # Initialize thread pool
         self.thread_pool = ThreadPoolManager(
             max_workers=actual_threads,
             task_handler=self._process_task,
-            on_task_complete=self._on_task_complete,
-            on_task_error=self._on_task_error,
+            on_task_complete=lambda task: self._on_task_complete(task, status_service),
+            on_task_error=lambda task, error: self._on_task_error(task, error, status_service),
             on_log=self._log,
             delay_between_tasks=self.delay_seconds.get()
         )
         
         # Optimize task distribution: Sort then Interleave (Striping)
         # 1. Sort tasks by settings
+        defaults = self._defaults
+        
         def get_sort_key(r):
             return (
-                r.type or self.default_type.get(),
-                r.aspect_ratio or self.default_aspect.get(),
-                r.resolution or self.default_resolution.get(),
-                r.duration or self.default_duration.get(),
-                r.variations if r.variations is not None else int(self.default_variations.get())
+                r.type or defaults.type,
+                r.aspect_ratio or defaults.aspect,
+                r.resolution or defaults.resolution,
+                r.duration or defaults.duration,
+                r.variations if r.variations is not None else defaults.variations
             )
         
         sorted_tasks = sorted(self.tasks, key=get_sort_key)
@@ -996,6 +1035,7 @@ class SoraToolApp:
         
         # Update UI periodically
         self._update_progress()
+        self._status_flush_id = self.root.after(2000, self._flush_status_buffer)
         
     def _process_task(self, task: Task, thread_id: int):
         """Process a single task (called in worker thread)"""
@@ -1024,10 +1064,11 @@ class SoraToolApp:
             browser.init_browser()
             self.browser_instances[thread_id] = browser
             
+            prefix = f"[T{thread_id}|{profile_name}] "
             sora = SoraAutomationService(
                 browser=browser,
                 download_dir=str(DOWNLOADS_DIR),
-                log_callback=lambda msg: self._log(f"[T{thread_id}|{profile_name}] {msg}")
+                log_callback=lambda msg, p=prefix: self._log(p + msg)
             )
             self.sora_instances[thread_id] = sora
         
@@ -1035,6 +1076,7 @@ class SoraToolApp:
         
         # Convert dict back to SheetRow
         # Apply Settings defaults when Excel values are empty
+        defaults = self._defaults
         row = SheetRow(
             row_index=data.get("row_index", 0),
             stt=data.get("stt", ""),
@@ -1044,25 +1086,25 @@ class SoraToolApp:
             output_path=data.get("output_path", str(DOWNLOADS_DIR)),
             presets=data.get("presets", ""),
             status=data.get("status", ""),
-            type=data.get("type") or self.default_type.get(),
-            aspect_ratio=data.get("aspect_ratio") or self.default_aspect.get(),
-            duration=data.get("duration") or self.default_duration.get(),
-            resolution=data.get("resolution") or self.default_resolution.get(),
-            variations=int(data.get("variations") or self.default_variations.get()),
+            type=data.get("type") or defaults.type,
+            aspect_ratio=data.get("aspect_ratio") or defaults.aspect,
+            duration=data.get("duration") or defaults.duration,
+            resolution=data.get("resolution") or defaults.resolution,
+            variations=int(data.get("variations") or defaults.variations),
         )
         
-        self._log(f"🔎 Task {row.row_index} Type Debug: Final='{row.type}' | Sheet='{data.get('type')}' | Default='{self.default_type.get()}'")
+        self._log(f"🔎 Task {row.row_index} Type Debug: Final='{row.type}' | Sheet='{data.get('type')}' | Default='{defaults.type}'")
         
         # Process
         result = sora.process_row(row)
         return result
         
-    def _on_task_complete(self, task: Task):
+    def _on_task_complete(self, task: Task, status_service: Optional[ExcelService]):
         """Called when a task completes"""
         self._update_stats()
         
         # Update Excel status based on result
-        if self.source_type.get() == "excel" and hasattr(self, 'excel_service'):
+        if status_service:
              row_index = task.data.get("row_index")
              if row_index is not None:
                  # Check success status from result dict
@@ -1071,41 +1113,93 @@ class SoraToolApp:
                      if not task.result.get("success", False):
                          status = "Failed"
                  
-                 self.excel_service.update_status(row_index, status)
+                 self._queue_status(status_service, row_index, status)
         
-    def _on_task_error(self, task: Task, error: Exception):
+    def _on_task_error(self, task: Task, error: Exception, status_service: Optional[ExcelService]):
         """Called when a task fails"""
         self._log(f"❌ Task {task.id} error: {error}")
         self._update_stats()
         
         # Update Excel status
-        if self.source_type.get() == "excel" and hasattr(self, 'excel_service'):
+        if status_service:
              row_index = task.data.get("row_index")
              if row_index is not None:
-                 self.excel_service.update_status(row_index, f"Failed: {error}")
+                 self._queue_status(status_service, row_index, f"Failed: {error}")
+                 
+    def _queue_status(self, service: ExcelService, row_index: int, status: str):
+        """Buffer an Excel status update for the run's workbook (called in worker thread)"""
+        with self._status_lock:
+            self._status_buffer.append((service, row_index, status))
+            
+        # After stop no timer flushes the buffer anymore, so write it right away
+        if not self.is_running:
+            self._write_status_buffer()
+            
+    def _flush_status_buffer(self):
+        """Hand buffered Excel status updates to a background writer (runs every 2s)"""
+        self._status_flush_id = None
+        if self._status_buffer:
+            threading.Thread(target=self._write_status_buffer, daemon=True).start()
+            
+        if self.is_running:
+            self._status_flush_id = self.root.after(2000, self._flush_status_buffer)
+            
+    def _write_status_buffer(self):
+        """Write buffered Excel status updates in one save (called in background thread)"""
+        with self._status_write_lock:
+            with self._status_lock:
+                batch = self._status_buffer
+                self._status_buffer = []
+                
+            # One save per workbook; a stopped run's late statuses may share a batch with the new run's
+            by_service: Dict[ExcelService, List[tuple]] = {}
+            for service, row_index, status in batch:
+                by_service.setdefault(service, []).append((row_index, status))
+            for service, updates in by_service.items():
+                service.update_statuses(updates)
+                
+    def _finish_run(self, pool: ThreadPoolManager):
+        """Wait for pool workers to exit, then write the remaining statuses (background thread)"""
+        if pool:
+            pool.stop(wait=True)
+        self._write_status_buffer()
         
     def _stop_execution(self):
         """Stop execution"""
-        if self.thread_pool:
-            self.thread_pool.stop(wait=False)
+        self.is_running = False
+        if self._status_flush_id:
+            self.root.after_cancel(self._status_flush_id)
+            self._status_flush_id = None
             
-        # Close browsers
-        for browser in self.browser_instances.values():
-            try:
-                browser.close()
-            except:
-                pass
+        # Close browsers in the background so the UI is not blocked by WebDriver teardown
+        browsers = list(self.browser_instances.values())
+        if browsers:
+            threading.Thread(target=self._close_browsers, args=(browsers,), daemon=True).start()
                 
         self.browser_instances.clear()
         self.sora_instances.clear()
         
-        self.is_running = False
+        # Workers may still be finishing tasks; join them and flush their statuses off the UI thread
+        threading.Thread(target=self._finish_run, args=(self.thread_pool,), daemon=True).start()
+        
         self.start_btn.config(state="normal")
         self.stop_btn.config(state="disabled")
         self.pause_btn.config(state="disabled")
         
         self._log("⏹️ Execution stopped")
         
+    def _close_browsers(self, browsers: List[BrowserCore]):
+        """Close browsers concurrently (called in background thread)"""
+        def safe_close(browser):
+            try:
+                browser.close()
+            except:
+                pass
+                
+        with ThreadPoolExecutor(max_workers=len(browsers)) as executor:
+            list(executor.map(safe_close, browsers))
+        self._log(f"🧹 Closed {len(browsers)} browser(s)")
+        
     def _pause_execution(self):
         """Pause/resume execution"""
         # TODO: Implement pause functionality
@@ -1127,13 +1221,15 @@ class SoraToolApp:
             self.status_label.config(text=f"Progress: {completed}/{total} ({progress:.1f}%)")
             
         # Check if all done
-        if self.thread_pool.get_pending_count() == 0 and self.thread_pool.get_running_count() == 0:
+        remaining = self.thread_pool.get_pending_count() + self.thread_pool.get_running_count()
+        if remaining == 0:
             self._log("✅ All tasks completed!")
             self._stop_execution()
             return
             
-        # Schedule next update
-        self.root.after(1000, self._update_progress)
+        # Schedule next update: poll faster near completion, slower in steady state
+        interval = 250 if remaining < self.thread_pool.max_workers * 2 else 2000
+        self.root.after(interval, self._update_progress)
         
     def _update_stats(self):
         """Update statistics labels"""
@@ -1147,22 +1243,29 @@ class SoraToolApp:
     
     def _log(self, message: str):
         """Thread-safe logging"""
-        import time
         timestamp = time.strftime("%H:%M:%S")
         self.log_queue.put(f"[{timestamp}] {message}")
         
     def _process_log_queue(self):
         """Process log messages from queue"""
         try:
-            while True:
-                message = self.log_queue.get_nowait()
-                self.log_text.config(state="normal")
-                self.log_text.insert("end", message + "\n")
+            messages = []
+            try:
+                while True:
+                    messages.append(self.log_queue.get_nowait())
+            except queue.Empty:
+                pass
+                
+            if messages:
+                self._log_mirror.extend(messages)
+                
+                # Insert the whole batch with the scrollbar callback detached
+                prev_cmd = self.log_text.cget("yscrollcommand")
+                self.log_text.config(state="normal", yscrollcommand="")
+                self.log_text.insert("end", "\n".join(messages) + "\n")
+                self.log_text.config(state="disabled", yscrollcommand=prev_cmd)
                 if self.auto_scroll_var.get():
                     self.log_text.see("end")
-                self.log_text.config(state="disabled")
-        except queue.Empty:
-            pass
         finally:
             self.root.after(100, self._process_log_queue)
             
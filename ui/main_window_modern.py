@@ -1,19 +1,32 @@
 """
 Modern UI for Sora Automation Tool
 Features: Dark theme, glassmorphism, smooth animations, premium design
+
+Launch with main_modern.py (or run_modern.bat), or from the project root:
+python -m ui.main_window_modern
 """
 import customtkinter as ctk
 from tkinter import messagebox, filedialog, scrolledtext
 import threading
 import queue
+import collections
+import itertools
 import os
 import sys
+import traceback
+import time
 from pathlib import Path
-from typing import List, Dict, Callable
+from types import SimpleNamespace
+from typing import List, Dict, Callable, Optional, Final
 import tkinter as tk
 
-# Add parent to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Pillow is needed for image icons on buttons
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    Image = None
+    HAS_PIL = False
 
 from config.settings import (
     load_settings, save_settings, load_profiles, save_profiles,
@@ -28,33 +41,96 @@ from services.sora_service import SoraAutomationService, GenerationStatus
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+# Maximum number of lines kept in the progress log
+MAX_LOG_LINES = 2000
+# Lines re-rendered into progress_text while it is scrolled to the bottom
+LOG_VISIBLE_LINES = 200
 
-class ModernColors:
-    """Modern color palette for the application"""
-    # Backgrounds
-    BG_PRIMARY = "#1a1d2e"
-    BG_SECONDARY = "#16213e"
-    BG_CARD = "#0f3460"
-    
-    # Accents
-    ACCENT_PRIMARY = "#3282b8"
-    ACCENT_SECONDARY = "#00d9ff"
-    ACCENT_HOVER = "#4a9fd8"
-    
-    # Status colors
-    SUCCESS = "#27ae60"
-    WARNING = "#f39c12"
-    ERROR = "#e74c3c"
-    INFO = "#3498db"
-    
-    # Text
-    TEXT_PRIMARY = "#ecf0f1"
-    TEXT_SECONDARY = "#95a5a6"
-    TEXT_MUTED = "#7f8c8d"
+# Log lines with this prefix are errors and are shown even in quiet mode
+LOG_ERROR_PREFIX = "❌"
+# Max pending log queue items; the oldest is discarded on overflow
+LOG_QUEUE_MAXSIZE = 10000
+# Fallback log queue poll interval (ms); normal drains are triggered by _log
+LOG_HEARTBEAT_MS = 500
+
+# Maximum number of log queue items handled per poll
+LOG_DRAIN_LIMIT = 200
+
+# Combobox options
+TYPE_OPTIONS = ("Video", "Image")
+ASPECT_RATIOS = ("9:16", "16:9", "1:1")
+OUTPUT_COUNTS = ("1", "2", "3", "4")
+RESOLUTIONS = ("480p", "720p", "1080p")
+DURATIONS = ("5s", "10s", "15s", "20s")
+MODELS = ("Sora (mặc định)", "Sora Turbo")
+
+# Button icons (assets/icons/<name>.png)
+ICONS_DIR = BASE_DIR / "assets" / "icons"
+ICON_NAMES = ("play", "stop", "add", "delete", "login", "folder", "import", "template")
+
+# Tab names
+TAB_CONTROL = "🎮 Đăng nhập & Tài khoản"
+TAB_EXECUTE = "⚡ Execute Media Workflow"
+TAB_TASKS = "📋 Tiến trình"
+TAB_SETTINGS = "⚙️ Cấu hình"
+TAB_HELP = "❓ Help"
+
+
+# Modern color palette for the application
+# Backgrounds
+BG_PRIMARY: Final = "#1a1d2e"
+BG_SECONDARY: Final = "#16213e"
+BG_CARD: Final = "#0f3460"
+
+# Accents
+ACCENT_PRIMARY: Final = "#3282b8"
+ACCENT_SECONDARY: Final = "#00d9ff"
+ACCENT_HOVER: Final = "#4a9fd8"
+
+# Status colors
+SUCCESS: Final = "#27ae60"
+WARNING: Final = "#f39c12"
+ERROR: Final = "#e74c3c"
+INFO: Final = "#3498db"
+
+# Text
+TEXT_PRIMARY: Final = "#ecf0f1"
+TEXT_SECONDARY: Final = "#95a5a6"
+TEXT_MUTED: Final = "#7f8c8d"
+
+# UI Elements
+BORDER: Final = "#2c3e50"
+HOVER: Final = "#34495e"
+
+
+class ModernFonts:
+    """Shared font objects, created once the root window exists"""
+    TITLE = None
+    HEADER = None
+    SUBHEADER = None
+    STAT_VALUE = None
+    BUTTON = None
+    BUTTON_LARGE = None
+    BODY_LARGE = None
+    BODY = None
+    SMALL = None
+    CAPTION = None
+    MONO = None
     
-    # UI Elements
-    BORDER = "#2c3e50"
-    HOVER = "#34495e"
+    @classmethod
+    def init(cls, root):
+        """Create the fonts; root must already exist as the default Tk root"""
+        cls.TITLE = ctk.CTkFont(family="Segoe UI", size=28, weight="bold")
+        cls.HEADER = ctk.CTkFont(family="Segoe UI", size=18, weight="bold")
+        cls.SUBHEADER = ctk.CTkFont(family="Segoe UI", size=16, weight="bold")
+        cls.STAT_VALUE = ctk.CTkFont(family="Segoe UI", size=32, weight="bold")
+        cls.BUTTON = ctk.CTkFont(family="Segoe UI", size=12, weight="bold")
+        cls.BUTTON_LARGE = ctk.CTkFont(family="Segoe UI", size=14, weight="bold")
+        cls.BODY_LARGE = ctk.CTkFont(family="Segoe UI", size=14)
+        cls.BODY = ctk.CTkFont(family="Segoe UI", size=12)
+        cls.SMALL = ctk.CTkFont(family="Segoe UI", size=11)
+        cls.CAPTION = ctk.CTkFont(family="Segoe UI", size=10)
+        cls.MONO = ctk.CTkFont(family="Consolas", size=10)
 
 
 class ModernButton(ctk.CTkButton):
@@ -64,10 +140,10 @@ class ModernButton(ctk.CTkButton):
         defaults = {
             "corner_radius": 8,
             "border_width": 0,
-            "fg_color": ModernColors.ACCENT_PRIMARY,
-            "hover_color": ModernColors.ACCENT_HOVER,
-            "text_color": ModernColors.TEXT_PRIMARY,
-            "font": ("Segoe UI", 12, "bold"),
+            "fg_color": ACCENT_PRIMARY,
+            "hover_color": ACCENT_HOVER,
+            "text_color": TEXT_PRIMARY,
+            "font": ModernFonts.BUTTON,
             "height": 40,
         }
         defaults.update(kwargs)
@@ -79,9 +155,9 @@ class ModernCard(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
         defaults = {
             "corner_radius": 12,
-            "fg_color": ModernColors.BG_CARD,
+            "fg_color": BG_CARD,
             "border_width": 1,
-            "border_color": ModernColors.BORDER,
+            "border_color": BORDER,
         }
         defaults.update(kwargs)
         super().__init__(master, **defaults)
@@ -91,8 +167,16 @@ class SoraToolModernApp:
     """Modern Sora Tool Application with premium UI"""
     
     def __init__(self):
+        self.settings = load_settings()
+        
+        # DPI awareness must be decided before the window is created
+        if self.settings.get("disable_dpi_scaling"):
+            ctk.deactivate_automatic_dpi_awareness()
+        
         # Create main window
         self.root = ctk.CTk()
+        ModernFonts.init(self.root)
+        self.icons = self._load_icons()
         self.root.title("🎬 Sora Tool v2.0.0")
         self.root.geometry("1400x900")
         self.root.minsize(1000, 700)
@@ -102,16 +186,55 @@ class SoraToolModernApp:
         self.root.grid_columnconfigure(0, weight=1)
         
         # State
-        self.settings = load_settings()
         self.profiles = load_profiles()
+        self._last_profile_keys = None  # Profile names last shown in the combobox
+        self._current_profile = ""  # Mirrors profile_combo, updated on selection
         self.tasks: List[SheetRow] = []
         self.is_running = False
         self.thread_pool: ThreadPoolManager = None
-        self.browser_instances: Dict[int, BrowserCore] = {}
+        self.browser_instances: Dict[str, BrowserCore] = {}  # profile_name -> browser
         self.sora_instances: Dict[int, SoraAutomationService] = {}
+        self._run_config: SimpleNamespace = None  # Execution settings read at START
+        
+        # Stat box values: requested vs. last shown, flushed at most every 250ms
+        self._stats: Dict[str, int] = {}
+        self._last_stats: Dict[str, int] = {}
+        self._stats_scheduled = False
+        
+        # Last options applied through _apply, keyed by id(widget)
+        self._last_cfg: Dict[int, Dict] = {}
+        
+        # Background jobs run one at a time on a persistent worker thread
+        self.job_queue = queue.Queue()
+        self._worker = threading.Thread(target=self._worker_loop, args=(self.job_queue,), daemon=True)
+        self._worker.start()
+        # Manual logins can block for minutes, so they get their own worker
+        self.login_queue = queue.Queue()
+        self._login_worker = threading.Thread(target=self._worker_loop, args=(self.login_queue,), daemon=True)
+        self._login_worker.start()
         
         # Message queue for thread-safe logging
-        self.log_queue = queue.Queue()
+        self.log_queue = queue.SimpleQueue()  # Bounded by _enqueue_log
+        self._dropped_logs = 0
+        # (second, "%H:%M:%S") of the last log line; one tuple so threads never see a torn pair
+        self._last_ts = (-1, "")
+        
+        # Initial folder for the template save dialog (Downloads, else cwd)
+        downloads_dir = Path.home() / "Downloads"
+        self._downloads_dir = str(downloads_dir if downloads_dir.exists() else Path.cwd())
+        # Last MAX_LOG_LINES log lines; progress_text only renders the tail
+        self._log_buf = collections.deque(maxlen=MAX_LOG_LINES)
+        self._wakeup_scheduled = False
+        self._wakeup_lock = threading.Lock()
+        self._alive = True  # False once the window is closing
+        self._log_enabled = not self.settings.get("quiet_log", False)
+        
+        # Repeats of the last log message are counted, then logged once as "(lặp lại N lần)"
+        self._last_msg = None
+        self._dup_count = 0
+        self._dup_flush_scheduled = False
+        self._dup_lock = threading.Lock()
+        self._after_id = None  # Pending log heartbeat
         
         # Build UI
         self._build_ui()
@@ -122,7 +245,7 @@ class SoraToolModernApp:
     def _build_ui(self):
         """Build the modern UI"""
         # Main container with gradient background
-        main_container = ctk.CTkFrame(self.root, fg_color=ModernColors.BG_PRIMARY)
+        main_container = ctk.CTkFrame(self.root, fg_color=BG_PRIMARY)
         main_container.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
         main_container.grid_rowconfigure(1, weight=1)
         main_container.grid_columnconfigure(0, weight=1)
@@ -133,9 +256,24 @@ class SoraToolModernApp:
         # Content area with tabs
         self._build_content(main_container)
         
+        # Non-modal notification, shown by _toast
+        self._toast_label = ctk.CTkLabel(
+            self.root,
+            text="",
+            font=ModernFonts.BODY,
+            fg_color=BG_CARD,
+            text_color=TEXT_PRIMARY,
+            corner_radius=8,
+            padx=16,
+            pady=8
+        )
+        self._toast_after_id = None
+        self._warn_after_id = None  # Pending _clear_warn
+        self._warn_restore = None  # exec_status_label (text, color) before the warning
+        
     def _build_header(self, parent):
         """Build modern header with gradient"""
-        header = ctk.CTkFrame(parent, height=80, fg_color=ModernColors.BG_SECONDARY, corner_radius=0)
+        header = ctk.CTkFrame(parent, height=80, fg_color=BG_SECONDARY, corner_radius=0)
         header.grid(row=0, column=0, sticky="ew", padx=0, pady=0)
         header.grid_columnconfigure(1, weight=1)
         
@@ -146,16 +284,16 @@ class SoraToolModernApp:
         title = ctk.CTkLabel(
             title_frame,
             text="🎬 Sora Automation Tool",
-            font=("Segoe UI", 28, "bold"),
-            text_color=ModernColors.TEXT_PRIMARY
+            font=ModernFonts.TITLE,
+            text_color=TEXT_PRIMARY
         )
         title.pack(side="left")
         
         version = ctk.CTkLabel(
             title_frame,
             text="v2.0.0",
-            font=("Segoe UI", 12),
-            text_color=ModernColors.TEXT_SECONDARY
+            font=ModernFonts.BODY,
+            text_color=TEXT_SECONDARY
         )
         version.pack(side="left", padx=10)
         
@@ -163,8 +301,8 @@ class SoraToolModernApp:
         self.status_indicator = ctk.CTkLabel(
             header,
             text="● Sẵn sàng",
-            font=("Segoe UI", 14),
-            text_color=ModernColors.SUCCESS
+            font=ModernFonts.BODY_LARGE,
+            text_color=SUCCESS
         )
         self.status_indicator.grid(row=0, column=1, sticky="e", padx=30)
         
@@ -178,29 +316,79 @@ class SoraToolModernApp:
         # Create tabview
         self.tabview = ctk.CTkTabview(
             content_frame,
-            fg_color=ModernColors.BG_SECONDARY,
-            segmented_button_fg_color=ModernColors.BG_CARD,
-            segmented_button_selected_color=ModernColors.ACCENT_PRIMARY,
-            segmented_button_selected_hover_color=ModernColors.ACCENT_HOVER,
-            segmented_button_unselected_color=ModernColors.BG_CARD,
-            segmented_button_unselected_hover_color=ModernColors.HOVER,
+            fg_color=BG_SECONDARY,
+            segmented_button_fg_color=BG_CARD,
+            segmented_button_selected_color=ACCENT_PRIMARY,
+            segmented_button_selected_hover_color=ACCENT_HOVER,
+            segmented_button_unselected_color=BG_CARD,
+            segmented_button_unselected_hover_color=HOVER,
             corner_radius=12,
+            command=self._on_tab_changed,
         )
         self.tabview.grid(row=0, column=0, sticky="nsew")
         
         # Add tabs
-        self.tab_control = self.tabview.add("🎮 Đăng nhập & Tài khoản")
-        self.tab_execute = self.tabview.add("⚡ Execute Media Workflow")
-        self.tab_tasks = self.tabview.add("📋 Tiến trình")
-        self.tab_settings = self.tabview.add("⚙️ Cấu hình")
-        self.tab_help = self.tabview.add("❓ Help")
-        
-        # Build tab contents
-        self._build_control_tab()
-        self._build_execute_tab()
-        self._build_tasks_tab()
-        self._build_settings_tab()
-        self._build_help_tab()
+        self.tab_control = self.tabview.add(TAB_CONTROL)
+        self.tab_execute = self.tabview.add(TAB_EXECUTE)
+        self.tab_tasks = self.tabview.add(TAB_TASKS)
+        self.tab_settings = self.tabview.add(TAB_SETTINGS)
+        self.tab_help = self.tabview.add(TAB_HELP)
+        
+        # Tab contents are built the first time each tab is shown
+        self._tab_builders = {
+            TAB_CONTROL: self._build_control_tab,
+            TAB_EXECUTE: self._build_execute_tab,
+            TAB_TASKS: self._build_tasks_tab,
+            TAB_SETTINGS: self._build_settings_tab,
+            TAB_HELP: self._build_help_tab,
+        }
+        self._built_tabs = set()
+        self._ensure_tab_built(self.tabview.get())
+        
+    def _ensure_tab_built(self, name: str):
+        """Build a tab's contents if it has not been built yet"""
+        if name not in self._built_tabs:
+            self._built_tabs.add(name)
+            self._tab_builders[name]()
+        
+    def _load_icons(self) -> Dict[str, ctk.CTkImage]:
+        """Load button icons on Windows, where color emoji rendering is slow"""
+        if sys.platform != "win32" or not HAS_PIL:
+            return {}
+            
+        icons = {}
+        for name in ICON_NAMES:
+            path = ICONS_DIR / f"{name}.png"
+            if path.exists():
+                icons[name] = ctk.CTkImage(Image.open(path), size=(16, 16))
+        return icons
+        
+    def _icon_label(self, icon: str, text: str, emoji: str) -> dict:
+        """Button label kwargs: image + plain text if the icon is loaded, emoji text otherwise"""
+        image = self.icons.get(icon)
+        if image is None:
+            return {"text": f"{emoji} {text}"}
+        return {"text": text, "image": image, "compound": "left"}
+        
+    def _deferred_build(self, parent, spec):
+        """
+        Create all widgets in spec first, then lay them out in one idle pass
+        
+        Args:
+            parent: Container for the widgets
+            spec: List of (cls, kwargs, geom_method, geom_kwargs) tuples
+            
+        Returns:
+            List of created widgets, in spec order
+        """
+        widgets = [cls(parent, **kwargs) for cls, kwargs, _, _ in spec]
+        
+        def apply_geometry():
+            for widget, (_, _, geom_method, geom_kwargs) in zip(widgets, spec):
+                getattr(widget, geom_method)(**geom_kwargs)
+                
+        parent.after_idle(apply_geometry)
+        return widgets
         
     def _build_control_tab(self):
         """Build login & account tab"""
@@ -216,8 +404,8 @@ class SoraToolModernApp:
         header = ctk.CTkLabel(
             account_card,
             text="👤 Quản lý Tài khoản",
-            font=("Segoe UI", 18, "bold"),
-            text_color=ModernColors.TEXT_PRIMARY
+            font=ModernFonts.HEADER,
+            text_color=TEXT_PRIMARY
         )
         header.grid(row=0, column=0, columnspan=3, sticky="w", padx=20, pady=(20, 10))
         
@@ -225,20 +413,22 @@ class SoraToolModernApp:
         ctk.CTkLabel(
             account_card,
             text="Profile:",
-            font=("Segoe UI", 14),
-            text_color=ModernColors.TEXT_SECONDARY
+            font=ModernFonts.BODY_LARGE,
+            text_color=TEXT_SECONDARY
         ).grid(row=1, column=0, sticky="w", padx=20, pady=10)
         
         self.profile_combo = ctk.CTkComboBox(
             account_card,
             width=300,
             height=40,
-            font=("Segoe UI", 12),
-            dropdown_font=("Segoe UI", 12),
-            fg_color=ModernColors.BG_SECONDARY,
-            border_color=ModernColors.BORDER,
-            button_color=ModernColors.ACCENT_PRIMARY,
-            button_hover_color=ModernColors.ACCENT_HOVER,
+            font=ModernFonts.BODY,
+            dropdown_font=ModernFonts.BODY,
+            fg_color=BG_SECONDARY,
+            border_color=BORDER,
+            button_color=ACCENT_PRIMARY,
+            button_hover_color=ACCENT_HOVER,
+            state="readonly",
+            command=self._on_profile_selected
         )
         self.profile_combo.grid(row=1, column=1, sticky="w", padx=10, pady=10)
         self._refresh_profiles()
@@ -247,29 +437,28 @@ class SoraToolModernApp:
         btn_frame = ctk.CTkFrame(account_card, fg_color="transparent")
         btn_frame.grid(row=1, column=2, sticky="e", padx=20, pady=10)
         
-        ModernButton(
-            btn_frame,
-            text="➕ Thêm",
-            width=100,
-            command=self._add_profile
-        ).pack(side="left", padx=5)
-        
-        ModernButton(
-            btn_frame,
-            text="🗑️ Xóa",
-            width=100,
-            fg_color=ModernColors.ERROR,
-            hover_color="#c0392b",
-            command=self._remove_profile
-        ).pack(side="left", padx=5)
+        self._deferred_build(btn_frame, [
+            (ModernButton, dict(
+                **self._icon_label("add", "Thêm", "➕"),
+                width=100,
+                command=self._add_profile
+            ), "pack", dict(side="left", padx=5)),
+            (ModernButton, dict(
+                **self._icon_label("delete", "Xóa", "🗑️"),
+                width=100,
+                fg_color=ERROR,
+                hover_color="#c0392b",
+                command=self._remove_profile
+            ), "pack", dict(side="left", padx=5)),
+        ])
         
         # Login button (prominent)
         login_btn = ModernButton(
             account_card,
-            text="🔐 Đăng nhập Sora",
+            **self._icon_label("login", "Đăng nhập Sora", "🔐"),
             height=50,
-            font=("Segoe UI", 14, "bold"),
-            fg_color=ModernColors.ACCENT_SECONDARY,
+            font=ModernFonts.BUTTON_LARGE,
+            fg_color=ACCENT_SECONDARY,
             hover_color="#00b8d4",
             command=self._open_browser_login
         )
@@ -288,8 +477,8 @@ class SoraToolModernApp:
         ctk.CTkLabel(
             data_card,
             text="📊 Data Source",
-            font=("Segoe UI", 18, "bold"),
-            text_color=ModernColors.TEXT_PRIMARY
+            font=ModernFonts.HEADER,
+            text_color=TEXT_PRIMARY
         ).grid(row=0, column=0, columnspan=3, sticky="w", padx=20, pady=(20, 10))
         
         # Source type
@@ -298,32 +487,31 @@ class SoraToolModernApp:
         source_frame = ctk.CTkFrame(data_card, fg_color="transparent")
         source_frame.grid(row=1, column=0, columnspan=3, sticky="w", padx=20, pady=10)
         
-        ctk.CTkRadioButton(
-            source_frame,
-            text="Excel File",
-            variable=self.source_type,
-            value="excel",
-            font=("Segoe UI", 12),
-            fg_color=ModernColors.ACCENT_PRIMARY,
-            hover_color=ModernColors.ACCENT_HOVER,
-        ).pack(side="left", padx=10)
-        
-        ctk.CTkRadioButton(
-            source_frame,
-            text="Google Sheets",
-            variable=self.source_type,
-            value="gsheet",
-            font=("Segoe UI", 12),
-            fg_color=ModernColors.ACCENT_PRIMARY,
-            hover_color=ModernColors.ACCENT_HOVER,
-        ).pack(side="left", padx=10)
+        self._deferred_build(source_frame, [
+            (ctk.CTkRadioButton, dict(
+                text="Excel File",
+                variable=self.source_type,
+                value="excel",
+                font=ModernFonts.BODY,
+                fg_color=ACCENT_PRIMARY,
+                hover_color=ACCENT_HOVER,
+            ), "pack", dict(side="left", padx=10)),
+            (ctk.CTkRadioButton, dict(
+                text="Google Sheets",
+                variable=self.source_type,
+                value="gsheet",
+                font=ModernFonts.BODY,
+                fg_color=ACCENT_PRIMARY,
+                hover_color=ACCENT_HOVER,
+            ), "pack", dict(side="left", padx=10)),
+        ])
         
         # File selection
         ctk.CTkLabel(
             data_card,
             text="Google Sheet URL:",
-            font=("Segoe UI", 12),
-            text_color=ModernColors.TEXT_SECONDARY
+            font=ModernFonts.BODY,
+            text_color=TEXT_SECONDARY
         ).grid(row=2, column=0, sticky="w", padx=20, pady=10)
         
         self.gsheet_url = tk.StringVar()
@@ -331,235 +519,152 @@ class SoraToolModernApp:
             data_card,
             textvariable=self.gsheet_url,
             height=40,
-            font=("Segoe UI", 12),
-            fg_color=ModernColors.BG_SECONDARY,
-            border_color=ModernColors.BORDER,
+            font=ModernFonts.BODY,
+            fg_color=BG_SECONDARY,
+            border_color=BORDER,
         ).grid(row=2, column=1, sticky="ew", padx=10, pady=10)
         
         # Action buttons
         btn_row = ctk.CTkFrame(data_card, fg_color="transparent")
         btn_row.grid(row=2, column=2, sticky="e", padx=20, pady=10)
         
-        ModernButton(
-            btn_row,
-            text="📂 Import từ Sheet",
-            width=150,
-            command=self._load_tasks
-        ).pack(side="left", padx=5)
-        
-        ModernButton(
-            btn_row,
-            text="📥 Import Excel",
-            width=150,
-            fg_color=ModernColors.INFO,
-            hover_color="#2980b9",
-            command=self._browse_excel
-        ).pack(side="left", padx=5)
-        
-        ModernButton(
-            btn_row,
-            text="📄 Tải Template",
-            width=150,
-            fg_color=ModernColors.WARNING,
-            hover_color="#e67e22",
-            command=self._download_template
-        ).pack(side="left", padx=5)
+        self._deferred_build(btn_row, [
+            (ModernButton, dict(
+                **self._icon_label("folder", "Import từ Sheet", "📂"),
+                width=150,
+                command=self._load_tasks
+            ), "pack", dict(side="left", padx=5)),
+            (ModernButton, dict(
+                **self._icon_label("import", "Import Excel", "📥"),
+                width=150,
+                fg_color=INFO,
+                hover_color="#2980b9",
+                command=self._browse_excel
+            ), "pack", dict(side="left", padx=5)),
+            (ModernButton, dict(
+                **self._icon_label("template", "Tải Template", "📄"),
+                width=150,
+                fg_color=WARNING,
+                hover_color="#e67e22",
+                command=self._download_template
+            ), "pack", dict(side="left", padx=5)),
+        ])
         
         # Task count
         self.task_count_label = ctk.CTkLabel(
             data_card,
             text="Chưa có tasks",
-            font=("Segoe UI", 12),
-            text_color=ModernColors.TEXT_SECONDARY
+            font=ModernFonts.BODY,
+            text_color=TEXT_SECONDARY
         )
         self.task_count_label.grid(row=3, column=0, columnspan=3, sticky="w", padx=20, pady=(5, 20))
         
         # Settings Card
+        # Rows 1-2 are gridded straight onto the card; column 10 absorbs the extra width
         settings_card = ModernCard(tab)
         settings_card.grid(row=1, column=0, sticky="ew", padx=20, pady=10)
-        settings_card.grid_columnconfigure(1, weight=1)
+        settings_card.grid_columnconfigure(10, weight=1)
         
         ctk.CTkLabel(
             settings_card,
             text="⚙️ Cấu hình",
-            font=("Segoe UI", 18, "bold"),
-            text_color=ModernColors.TEXT_PRIMARY
-        ).grid(row=0, column=0, columnspan=4, sticky="w", padx=20, pady=(20, 10))
+            font=ModernFonts.HEADER,
+            text_color=TEXT_PRIMARY
+        ).grid(row=0, column=0, columnspan=10, sticky="w", padx=20, pady=(20, 10))
         
         # Settings row 1
-        settings_row1 = ctk.CTkFrame(settings_card, fg_color="transparent")
-        settings_row1.grid(row=1, column=0, columnspan=4, sticky="ew", padx=20, pady=10)
-        
-        # Type
-        ctk.CTkLabel(
-            settings_row1,
-            text="Type:",
-            font=("Segoe UI", 12),
-            text_color=ModernColors.TEXT_SECONDARY
-        ).pack(side="left", padx=(0, 10))
-        
-        self.type_var = tk.StringVar(value="Video")
-        ctk.CTkComboBox(
-            settings_row1,
-            variable=self.type_var,
-            values=["Video", "Image"],
-            width=120,
-            height=35,
-            font=("Segoe UI", 11),
-            fg_color=ModernColors.BG_SECONDARY,
-            border_color=ModernColors.BORDER,
-        ).pack(side="left", padx=10)
-        
-        # Aspect Ratio
-        ctk.CTkLabel(
-            settings_row1,
-            text="Aspect Ratio:",
-            font=("Segoe UI", 12),
-            text_color=ModernColors.TEXT_SECONDARY
-        ).pack(side="left", padx=(30, 10))
-        
-        self.aspect_var = tk.StringVar(value="9:16")
-        ctk.CTkComboBox(
-            settings_row1,
-            variable=self.aspect_var,
-            values=["9:16", "16:9", "1:1"],
-            width=120,
+        combo_style = dict(
             height=35,
-            font=("Segoe UI", 11),
-            fg_color=ModernColors.BG_SECONDARY,
-            border_color=ModernColors.BORDER,
-        ).pack(side="left", padx=10)
-        
-        # Outputs
-        ctk.CTkLabel(
-            settings_row1,
-            text="Outputs:",
-            font=("Segoe UI", 12),
-            text_color=ModernColors.TEXT_SECONDARY
-        ).pack(side="left", padx=(30, 10))
-        
-        self.outputs_var = tk.StringVar(value="1")
-        ctk.CTkComboBox(
-            settings_row1,
-            variable=self.outputs_var,
-            values=["1", "2", "3", "4"],
-            width=80,
-            height=35,
-            font=("Segoe UI", 11),
-            fg_color=ModernColors.BG_SECONDARY,
-            border_color=ModernColors.BORDER,
-        ).pack(side="left", padx=10)
-        
-        # Resolution
-        ctk.CTkLabel(
-            settings_row1,
-            text="Resolution:",
-            font=("Segoe UI", 12),
-            text_color=ModernColors.TEXT_SECONDARY
-        ).pack(side="left", padx=(30, 10))
-        
-        self.resolution_var = tk.StringVar(value="480p")
-        ctk.CTkComboBox(
-            settings_row1,
-            variable=self.resolution_var,
-            values=["480p", "720p", "1080p"],
-            width=120,
-            height=35,
-            font=("Segoe UI", 11),
-            fg_color=ModernColors.BG_SECONDARY,
-            border_color=ModernColors.BORDER,
-        ).pack(side="left", padx=10)
-        
-        # Duration
-        ctk.CTkLabel(
-            settings_row1,
-            text="Duration:",
-            font=("Segoe UI", 12),
-            text_color=ModernColors.TEXT_SECONDARY
-        ).pack(side="left", padx=(30, 10))
-        
-        self.duration_var = tk.StringVar(value="10s")
-        ctk.CTkComboBox(
-            settings_row1,
-            variable=self.duration_var,
-            values=["5s", "10s", "15s", "20s"],
-            width=100,
-            height=35,
-            font=("Segoe UI", 11),
-            fg_color=ModernColors.BG_SECONDARY,
-            border_color=ModernColors.BORDER,
-        ).pack(side="left", padx=10)
+            font=ModernFonts.SMALL,
+            fg_color=BG_SECONDARY,
+            border_color=BORDER,
+        )
+        self.type_combo = ctk.CTkComboBox(settings_card, values=TYPE_OPTIONS, width=120, **combo_style)
+        self.type_combo.set("Video")
+        self.aspect_combo = ctk.CTkComboBox(settings_card, values=ASPECT_RATIOS, width=120, **combo_style)
+        self.aspect_combo.set("9:16")
+        self.outputs_combo = ctk.CTkComboBox(settings_card, values=OUTPUT_COUNTS, width=80, **combo_style)
+        self.outputs_combo.set("1")
+        self.resolution_combo = ctk.CTkComboBox(settings_card, values=RESOLUTIONS, width=120, **combo_style)
+        self.resolution_combo.set("480p")
+        self.duration_combo = ctk.CTkComboBox(settings_card, values=DURATIONS, width=100, **combo_style)
+        self.duration_combo.set("10s")
+        
+        pairs = [
+            ("Type:", self.type_combo),
+            ("Aspect Ratio:", self.aspect_combo),
+            ("Outputs:", self.outputs_combo),
+            ("Resolution:", self.resolution_combo),
+            ("Duration:", self.duration_combo),
+        ]
+        for col, (text, widget) in enumerate(pairs):
+            label = ctk.CTkLabel(
+                settings_card,
+                text=text,
+                font=ModernFonts.BODY,
+                text_color=TEXT_SECONDARY
+            )
+            label.grid(row=1, column=col * 2, sticky="w", padx=(20 if col == 0 else 30, 10), pady=10)
+            widget.grid(row=1, column=col * 2 + 1, sticky="w", padx=10, pady=10)
         
         # Settings row 2
-        settings_row2 = ctk.CTkFrame(settings_card, fg_color="transparent")
-        settings_row2.grid(row=2, column=0, columnspan=4, sticky="ew", padx=20, pady=(5, 20))
-        
-        # Model
         ctk.CTkLabel(
-            settings_row2,
+            settings_card,
             text="Model:",
-            font=("Segoe UI", 12),
-            text_color=ModernColors.TEXT_SECONDARY
-        ).pack(side="left", padx=(0, 10))
-        
-        self.model_var = tk.StringVar(value="Sora (mặc định)")
-        ctk.CTkComboBox(
-            settings_row2,
-            variable=self.model_var,
-            values=["Sora (mặc định)", "Sora Turbo"],
-            width=180,
-            height=35,
-            font=("Segoe UI", 11),
-            fg_color=ModernColors.BG_SECONDARY,
-            border_color=ModernColors.BORDER,
-        ).pack(side="left", padx=10)
+            font=ModernFonts.BODY,
+            text_color=TEXT_SECONDARY
+        ).grid(row=2, column=0, sticky="w", padx=(20, 10), pady=(5, 20))
+        
+        self.model_combo = ctk.CTkComboBox(settings_card, values=MODELS, width=180, **combo_style)
+        self.model_combo.set("Sora (mặc định)")
+        self.model_combo.grid(row=2, column=1, sticky="w", padx=10, pady=(5, 20))
         
         # Checkboxes
         self.headless_var = tk.BooleanVar(value=False)
         ctk.CTkCheckBox(
-            settings_row2,
+            settings_card,
             text="Headless (ẩn browser)",
             variable=self.headless_var,
-            font=("Segoe UI", 11),
-            fg_color=ModernColors.ACCENT_PRIMARY,
-            hover_color=ModernColors.ACCENT_HOVER,
-        ).pack(side="left", padx=30)
+            font=ModernFonts.SMALL,
+            fg_color=ACCENT_PRIMARY,
+            hover_color=ACCENT_HOVER,
+        ).grid(row=2, column=2, columnspan=2, sticky="w", padx=30, pady=(5, 20))
         
         self.multi_browser_var = tk.BooleanVar(value=False)
         ctk.CTkCheckBox(
-            settings_row2,
+            settings_card,
             text="Multi-browser mode",
             variable=self.multi_browser_var,
-            font=("Segoe UI", 11),
-            fg_color=ModernColors.ACCENT_PRIMARY,
-            hover_color=ModernColors.ACCENT_HOVER,
-        ).pack(side="left", padx=10)
+            font=ModernFonts.SMALL,
+            fg_color=ACCENT_PRIMARY,
+            hover_color=ACCENT_HOVER,
+        ).grid(row=2, column=4, columnspan=2, sticky="w", padx=10, pady=(5, 20))
         
         # Workers
         ctk.CTkLabel(
-            settings_row2,
+            settings_card,
             text="Workers:",
-            font=("Segoe UI", 12),
-            text_color=ModernColors.TEXT_SECONDARY
-        ).pack(side="left", padx=(30, 10))
+            font=ModernFonts.BODY,
+            text_color=TEXT_SECONDARY
+        ).grid(row=2, column=6, sticky="w", padx=(30, 10), pady=(5, 20))
         
-        self.workers_var = tk.IntVar(value=1)
-        ctk.CTkEntry(
-            settings_row2,
-            textvariable=self.workers_var,
+        self.workers_entry = ctk.CTkEntry(
+            settings_card,
             width=80,
             height=35,
-            font=("Segoe UI", 11),
-            fg_color=ModernColors.BG_SECONDARY,
-            border_color=ModernColors.BORDER,
-        ).pack(side="left", padx=10)
+            font=ModernFonts.SMALL,
+            fg_color=BG_SECONDARY,
+            border_color=BORDER,
+        )
+        self.workers_entry.insert(0, "1")
+        self.workers_entry.grid(row=2, column=7, sticky="w", padx=10, pady=(5, 20))
         
         ctk.CTkLabel(
-            settings_row2,
+            settings_card,
             text="(0 profiles)",
-            font=("Segoe UI", 10),
-            text_color=ModernColors.TEXT_MUTED
-        ).pack(side="left", padx=5)
+            font=ModernFonts.CAPTION,
+            text_color=TEXT_MUTED
+        ).grid(row=2, column=8, columnspan=2, sticky="w", padx=5, pady=(5, 20))
         
         # Control Buttons
         control_card = ModernCard(tab)
@@ -569,40 +674,53 @@ class SoraToolModernApp:
         btn_container = ctk.CTkFrame(control_card, fg_color="transparent")
         btn_container.grid(row=0, column=0, pady=30)
         
-        self.start_btn = ModernButton(
-            btn_container,
-            text="▶ START",
-            width=200,
-            height=60,
-            font=("Segoe UI", 16, "bold"),
-            fg_color=ModernColors.SUCCESS,
-            hover_color="#229954",
-            command=self._start_execution
-        )
-        self.start_btn.pack(side="left", padx=10)
-        
-        self.stop_btn = ModernButton(
-            btn_container,
-            text="⏹ STOP",
-            width=200,
-            height=60,
-            font=("Segoe UI", 16, "bold"),
-            fg_color=ModernColors.ERROR,
-            hover_color="#c0392b",
-            command=self._stop_execution,
-            state="disabled"
-        )
-        self.stop_btn.pack(side="left", padx=10)
+        self.start_btn, self.stop_btn = self._deferred_build(btn_container, [
+            (ModernButton, dict(
+                **self._icon_label("play", "START", "▶"),
+                width=200,
+                height=60,
+                font=ModernFonts.SUBHEADER,
+                fg_color=SUCCESS,
+                hover_color="#229954",
+                command=self._start_execution
+            ), "pack", dict(side="left", padx=10)),
+            (ModernButton, dict(
+                **self._icon_label("stop", "STOP", "⏹"),
+                width=200,
+                height=60,
+                font=ModernFonts.SUBHEADER,
+                fg_color=ERROR,
+                hover_color="#c0392b",
+                command=self._stop_execution,
+                state="disabled"
+            ), "pack", dict(side="left", padx=10)),
+        ])
         
         # Status label
         self.exec_status_label = ctk.CTkLabel(
             control_card,
             text="✅ Sẵn sàng",
-            font=("Segoe UI", 14),
-            text_color=ModernColors.SUCCESS
+            font=ModernFonts.BODY_LARGE,
+            text_color=SUCCESS
         )
         self.exec_status_label.grid(row=1, column=0, pady=(0, 20))
         
+        # Widget options applied on each run state change
+        self._ui_modes = {
+            "running": [
+                (self.start_btn, {"state": "disabled"}),
+                (self.stop_btn, {"state": "normal"}),
+                (self.status_indicator, {"text": "● Đang chạy", "text_color": INFO}),
+                (self.exec_status_label, {"text": "⚡ Đang thực thi...", "text_color": INFO}),
+            ],
+            "stopped": [
+                (self.start_btn, {"state": "normal"}),
+                (self.stop_btn, {"state": "disabled"}),
+                (self.status_indicator, {"text": "● Đã dừng", "text_color": WARNING}),
+                (self.exec_status_label, {"text": "⏹ Đã dừng", "text_color": WARNING}),
+            ],
+        }
+        
     def _build_tasks_tab(self):
         """Build tasks progress tab"""
         tab = self.tab_tasks
@@ -620,38 +738,43 @@ class SoraToolModernApp:
         # Stats boxes
         self.stats_widgets = {}
         stats_data = [
-            ("Đang chạy", "0", ModernColors.INFO, "RUNNING"),
-            ("Đang đợi", "0", ModernColors.WARNING, "QUEUE"),
-            ("Hoàn thành", "0", ModernColors.SUCCESS, "pending"),
-            ("Lỗi", "0", ModernColors.ERROR, "failed"),
+            ("Đang chạy", "0", INFO, "RUNNING"),
+            ("Đang đợi", "0", WARNING, "QUEUE"),
+            ("Hoàn thành", "0", SUCCESS, "pending"),
+            ("Lỗi", "0", ERROR, "failed"),
         ]
         
-        for i, (label, value, color, key) in enumerate(stats_data):
-            stat_box = ctk.CTkFrame(
-                stats_container,
+        stat_boxes = self._deferred_build(stats_container, [
+            (ctk.CTkFrame, dict(
                 fg_color=color,
                 corner_radius=10,
                 width=150,
                 height=100
-            )
-            stat_box.pack(side="left", padx=15)
+            ), "pack", dict(side="left", padx=15))
+            for _, _, color, _ in stats_data
+        ])
+        
+        for stat_box, (label, value, color, key) in zip(stat_boxes, stats_data):
             stat_box.pack_propagate(False)
             
             ctk.CTkLabel(
                 stat_box,
                 text=label,
-                font=("Segoe UI", 12),
+                font=ModernFonts.BODY,
                 text_color="white"
             ).pack(pady=(15, 5))
             
             value_label = ctk.CTkLabel(
                 stat_box,
                 text=value,
-                font=("Segoe UI", 32, "bold"),
+                font=ModernFonts.STAT_VALUE,
                 text_color="white"
             )
             value_label.pack()
             self.stats_widgets[key] = value_label
+            
+        # Show any stats reported before this tab was built
+        self._flush_stats()
         
         # Progress section
         progress_card = ModernCard(tab)
@@ -662,8 +785,8 @@ class SoraToolModernApp:
         ctk.CTkLabel(
             progress_card,
             text="📊 Chi tiết tiến trình",
-            font=("Segoe UI", 16, "bold"),
-            text_color=ModernColors.TEXT_PRIMARY
+            font=ModernFonts.SUBHEADER,
+            text_color=TEXT_PRIMARY
         ).grid(row=0, column=0, sticky="w", padx=20, pady=(20, 10))
         
         # Create text widget for logs (using tkinter for scrolled text)
@@ -671,10 +794,10 @@ class SoraToolModernApp:
             progress_card,
             wrap="word",
             height=20,
-            font=("Consolas", 10),
-            bg=ModernColors.BG_SECONDARY,
-            fg=ModernColors.TEXT_PRIMARY,
-            insertbackground=ModernColors.TEXT_PRIMARY,
+            font=("Consolas", 10),  # Point size: CTkFont sizes are pixels and only CTk widgets rescale them
+            bg=BG_SECONDARY,
+            fg=TEXT_PRIMARY,
+            insertbackground=TEXT_PRIMARY,
             relief="flat",
             borderwidth=0,
         )
@@ -692,16 +815,31 @@ class SoraToolModernApp:
         ctk.CTkLabel(
             settings_card,
             text="⚙️ Cài đặt nâng cao",
-            font=("Segoe UI", 18, "bold"),
-            text_color=ModernColors.TEXT_PRIMARY
+            font=ModernFonts.HEADER,
+            text_color=TEXT_PRIMARY
         ).pack(padx=20, pady=(20, 10), anchor="w")
         
-        ctk.CTkLabel(
+        self.disable_dpi_var = tk.BooleanVar(value=self.settings.get("disable_dpi_scaling", False))
+        ctk.CTkCheckBox(
             settings_card,
-            text="Các cài đặt sẽ được thêm vào phiên bản sau...",
-            font=("Segoe UI", 12),
-            text_color=ModernColors.TEXT_SECONDARY
-        ).pack(padx=20, pady=20)
+            text="Tắt DPI scaling tự động (áp dụng sau khi khởi động lại)",
+            variable=self.disable_dpi_var,
+            font=ModernFonts.SMALL,
+            fg_color=ACCENT_PRIMARY,
+            hover_color=ACCENT_HOVER,
+            command=self._on_dpi_scaling_toggle,
+        ).pack(padx=20, pady=(10, 5), anchor="w")
+        
+        self.quiet_log_var = tk.BooleanVar(value=self.settings.get("quiet_log", False))
+        ctk.CTkCheckBox(
+            settings_card,
+            text="Chế độ im lặng (chỉ ghi lỗi vào nhật ký tiến trình)",
+            variable=self.quiet_log_var,
+            font=ModernFonts.SMALL,
+            fg_color=ACCENT_PRIMARY,
+            hover_color=ACCENT_HOVER,
+            command=self._on_quiet_log_toggle,
+        ).pack(padx=20, pady=(5, 20), anchor="w")
         
     def _build_help_tab(self):
         """Build help tab"""
@@ -717,8 +855,8 @@ class SoraToolModernApp:
         ctk.CTkLabel(
             help_card,
             text="❓ Hướng dẫn sử dụng",
-            font=("Segoe UI", 18, "bold"),
-            text_color=ModernColors.TEXT_PRIMARY
+            font=ModernFonts.HEADER,
+            text_color=TEXT_PRIMARY
         ).grid(row=0, column=0, sticky="w", padx=20, pady=(20, 10))
         
         help_text = """
@@ -744,30 +882,67 @@ class SoraToolModernApp:
    • Theo dõi số lượng tasks đang chạy, hoàn thành, lỗi
         """
         
-        help_display = scrolledtext.ScrolledText(
-            help_card,
-            wrap="word",
-            font=("Segoe UI", 11),
-            bg=ModernColors.BG_SECONDARY,
-            fg=ModernColors.TEXT_PRIMARY,
-            relief="flat",
-            borderwidth=0,
-        )
-        help_display.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
-        help_display.insert("1.0", help_text)
-        help_display.config(state="disabled")
+        help_scroll = ctk.CTkScrollableFrame(help_card, fg_color=BG_SECONDARY)
+        help_scroll.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
+        
+        ctk.CTkLabel(
+            help_scroll,
+            text=help_text,
+            font=ModernFonts.SMALL,
+            text_color=TEXT_PRIMARY,
+            justify="left",
+            anchor="w",
+        ).pack(fill="x", padx=12, pady=12)
         
     # ==================== Event Handlers ====================
     
+    def _on_tab_changed(self):
+        """Handle tab switch"""
+        current = self.tabview.get()
+        self._ensure_tab_built(current)
+        
+        if current == TAB_TASKS:
+            self._render_log_tail()
+    
+    def _on_dpi_scaling_toggle(self):
+        """Persist the DPI scaling preference"""
+        self.settings["disable_dpi_scaling"] = self.disable_dpi_var.get()
+        save_settings(self.settings)
+        self._log("💾 Đã lưu cài đặt DPI scaling (khởi động lại để áp dụng)")
+        
+    def _on_quiet_log_toggle(self):
+        """Turn progress logging off/on and persist the choice"""
+        quiet = self.quiet_log_var.get()
+        self.settings["quiet_log"] = quiet
+        save_settings(self.settings)
+        if quiet:
+            self._log("🔇 Đã bật chế độ im lặng")
+            self._log_enabled = False
+        else:
+            self._log_enabled = True
+            self._log("🔊 Đã tắt chế độ im lặng")
+            
     def _refresh_profiles(self):
         """Refresh profile combobox"""
+        profile_keys = tuple(sorted(self.profiles))
+        if profile_keys == self._last_profile_keys:
+            return
+        self._last_profile_keys = profile_keys
+        
         profiles = list(self.profiles.keys())
         if profiles:
             self.profile_combo.configure(values=profiles)
             self.profile_combo.set(profiles[0])
+            self._current_profile = profiles[0]
         else:
             self.profile_combo.configure(values=["Chưa có profile"])
             self.profile_combo.set("Chưa có profile")
+            self._current_profile = ""
+            
+    def _on_profile_selected(self, name: str):
+        """Remember the profile picked in the combobox"""
+        # The "Chưa có profile" placeholder maps to no profile
+        self._current_profile = name if name in self.profiles else ""
             
     def _add_profile(self):
         """Add new profile"""
@@ -788,8 +963,8 @@ class SoraToolModernApp:
             
     def _remove_profile(self):
         """Remove selected profile"""
-        name = self.profile_combo.get()
-        if name and name != "Chưa có profile":
+        name = self._current_profile
+        if name:
             if messagebox.askyesno("Xác nhận", f"Xóa profile '{name}'?"):
                 del self.profiles[name]
                 save_profiles(self.profiles)
@@ -798,33 +973,41 @@ class SoraToolModernApp:
                 
     def _open_browser_login(self):
         """Open browser for manual login"""
-        profile_name = self.profile_combo.get()
-        if not profile_name or profile_name == "Chưa có profile":
+        profile_name = self._current_profile
+        if not profile_name:
             messagebox.showwarning("Cảnh báo", "Vui lòng tạo hoặc chọn profile")
             return
             
-        profile = self.profiles.get(profile_name, {})
-        cache_dir = profile.get("cache_dir", str(CHROME_CACHE_DIR / profile_name))
+        self.login_queue.put((self._do_login, (profile_name,)))
         
-        def login_thread():
-            try:
-                browser = BrowserCore(cache_dir=cache_dir, log_callback=self._log)
-                browser.build_driver()
-                browser.navigate(SoraAutomationService.BASE_URL)
-                self._log(f"🔐 Đã mở browser. Vui lòng đăng nhập thủ công.")
-                
-                sora = SoraAutomationService(browser, log_callback=self._log)
-                if sora.wait_for_manual_login(timeout=300):
-                    self._log("✅ Đăng nhập thành công!")
-                    messagebox.showinfo("Thành công", "Đăng nhập thành công! Profile đã được lưu.")
-                else:
-                    self._log("⚠️ Timeout khi đợi đăng nhập")
-                    
-            except Exception as e:
-                self._log(f"❌ Lỗi đăng nhập: {e}")
+    def _do_login(self, profile_name: str):
+        """Open browser and wait for manual login (called in worker thread)"""
+        try:
+            # Reuse the profile's browser if it is still open
+            browser = self.browser_instances.get(profile_name)
+            if browser is None or not browser.is_alive():
+                if browser is not None:
+                    # Window was closed: still quit the driver so its service process exits
+                    try:
+                        browser.close()
+                    except:
+                        pass
+                browser = BrowserCore(profile_name=profile_name)
+                browser.init_browser()
+                self.browser_instances[profile_name] = browser
+            browser.navigate(SoraAutomationService.BASE_URL)
+            self._log(f"🔐 Đã mở browser. Vui lòng đăng nhập thủ công.")
+            
+            sora = SoraAutomationService(browser, log_callback=self._log)
+            if sora.wait_for_manual_login(timeout=300):
+                self._log("✅ Đăng nhập thành công!")
+                self.root.after(0, lambda: messagebox.showinfo("Thành công", "Đăng nhập thành công! Profile đã được lưu."))
+            else:
+                self._log("⚠️ Timeout khi đợi đăng nhập")
                 
-        threading.Thread(target=login_thread, daemon=True).start()
-        
+        except Exception as e:
+            self._log(f"❌ Lỗi đăng nhập: {e}")
+            
     def _browse_excel(self):
         """Browse for Excel file"""
         filepath = filedialog.askopenfilename(
@@ -832,10 +1015,11 @@ class SoraToolModernApp:
             filetypes=[("Excel Files", "*.xlsx *.xls"), ("All Files", "*.*")]
         )
         if filepath:
-            self._load_excel(filepath)
+            self._apply(self.task_count_label, text="⏳ Đang load...", text_color=TEXT_SECONDARY)
+            self.job_queue.put((self._do_load_excel, (filepath,)))
             
-    def _load_excel(self, filepath):
-        """Load tasks from Excel"""
+    def _do_load_excel(self, filepath):
+        """Load tasks from Excel (called in worker thread)"""
         try:
             # Get output_dir and image_dir from settings
             output_dir = self.settings.get("output_folder", str(DOWNLOADS_DIR))
@@ -847,38 +1031,60 @@ class SoraToolModernApp:
                 output_dir=output_dir
             )
             if service.load(filepath):
-                self.tasks = service.read_worksheet(skip_completed=True)
-                self.task_count_label.configure(
-                    text=f"✅ Đã load {len(self.tasks)} tasks",
-                    text_color=ModernColors.SUCCESS
+                tasks = service.read_worksheet(
+                    skip_completed=True,
+                    progress_callback=lambda count: self._post_ui_event("progress", count)
                 )
-                self._log(f"📂 Đã load {len(self.tasks)} tasks từ Excel")
+            else:
+                tasks = None
+            # Same channel as the progress events, so it is applied after all of them
+            self._post_ui_event("loaded", tasks)
         except Exception as e:
-            messagebox.showerror("Lỗi", f"Không thể load file: {e}")
+            error = f"Không thể load file: {e}"
+            self._post_ui_event("loaded", None)
+            self.root.after(0, lambda: messagebox.showerror("Lỗi", error))
             self._log(f"❌ Lỗi load Excel: {e}")
             
+    def _on_excel_loaded(self, tasks: Optional[List[SheetRow]]):
+        """Apply loaded Excel tasks to the UI (None means the load failed)"""
+        if tasks is None:
+            self._apply(self.task_count_label, text="❌ Load thất bại", text_color=ERROR)
+            return
+            
+        self.tasks = tasks
+        self._apply(
+            self.task_count_label,
+            text=f"✅ Đã load {len(self.tasks)} tasks",
+            text_color=SUCCESS
+        )
+        self._log(f"📂 Đã load {len(self.tasks)} tasks từ Excel")
+            
     def _download_template(self):
         """Download Excel template"""
-        # Lưu vào thư mục Downloads hoặc thư mục hiện tại
-        import os
-        from pathlib import Path
-        
-        # Lấy thư mục Downloads
-        downloads_dir = Path.home() / "Downloads"
-        if not downloads_dir.exists():
-            downloads_dir = Path.cwd()  # Fallback về thư mục hiện tại
-        
         filepath = filedialog.asksaveasfilename(
             title="Lưu Template",
             defaultextension=".xlsx",
-            initialdir=str(downloads_dir),  # Mở ở thư mục Downloads
-            initialname="sora_template.xlsx",
+            initialdir=self._downloads_dir,  # Mở ở thư mục đã lưu gần nhất
+            initialfile="sora_template.xlsx",
             filetypes=[("Excel Files", "*.xlsx")]
         )
         if filepath:
+            self._downloads_dir = os.path.dirname(filepath)
+            self._log("💾 Đang lưu template...")
+            self.job_queue.put((self._do_create_template, (filepath,)))
+            
+    def _do_create_template(self, filepath):
+        """Write the Excel template (called in worker thread)"""
+        try:
             create_template_excel(filepath)
-            messagebox.showinfo("Thành công", f"Đã lưu template:\n{filepath}")
-            self._log(f"📥 Đã tải template: {filepath}")
+        except Exception as e:
+            error = f"Không thể lưu template: {e}"
+            self.root.after(0, lambda: messagebox.showerror("Lỗi", error))
+            self._log(f"❌ Lỗi lưu template: {e}")
+            return
+            
+        self._log(f"📥 Đã tải template: {filepath}")
+        self.root.after(0, lambda: self._toast(f"✅ Đã lưu template: {os.path.basename(filepath)}"))
             
     def _load_tasks(self):
         """Load tasks from Google Sheets"""
@@ -887,58 +1093,316 @@ class SoraToolModernApp:
     def _start_execution(self):
         """Start task execution"""
         if not self.tasks:
-            messagebox.showwarning("Cảnh báo", "Chưa có tasks để thực thi")
+            self._warn_inline("Chưa có tasks để thực thi")
             return
             
-        profile_name = self.profile_combo.get()
-        if not profile_name or profile_name == "Chưa có profile":
-            messagebox.showwarning("Cảnh báo", "Vui lòng chọn profile")
+        if not self._current_profile:
+            self._warn_inline("Vui lòng chọn profile")
             return
             
         self.is_running = True
-        self.start_btn.configure(state="disabled")
-        self.stop_btn.configure(state="normal")
-        self.status_indicator.configure(text="● Đang chạy", text_color=ModernColors.INFO)
-        self.exec_status_label.configure(text="⚡ Đang thực thi...", text_color=ModernColors.INFO)
+        self._set_ui_mode("running")
+        
+        # Read execution settings once from the widgets
+        workers = self.workers_entry.get().strip()
+        self._run_config = SimpleNamespace(
+            type=self.type_combo.get(),
+            aspect=self.aspect_combo.get(),
+            outputs=self.outputs_combo.get(),
+            resolution=self.resolution_combo.get(),
+            duration=self.duration_combo.get(),
+            model=self.model_combo.get(),
+            workers=int(workers) if workers.isdigit() else 1,
+        )
         
+        self._update_stats({"RUNNING": 0, "QUEUE": len(self.tasks), "pending": 0, "failed": 0})
         self._log(f"🚀 Bắt đầu thực thi với {len(self.tasks)} tasks")
+        self._log(
+            f"⚙️ {self._run_config.type} | {self._run_config.aspect} | {self._run_config.resolution} | "
+            f"{self._run_config.duration} | x{self._run_config.outputs} | {self._run_config.model} | "
+            f"{self._run_config.workers} workers"
+        )
         
         # TODO: Implement actual execution logic
         
     def _stop_execution(self):
         """Stop execution"""
         self.is_running = False
-        self.start_btn.configure(state="normal")
-        self.stop_btn.configure(state="disabled")
-        self.status_indicator.configure(text="● Đã dừng", text_color=ModernColors.WARNING)
-        self.exec_status_label.configure(text="⏹ Đã dừng", text_color=ModernColors.WARNING)
+        self._set_ui_mode("stopped")
         
         self._log("⏹️ Đã dừng thực thi")
         
+    def _worker_loop(self, jobs: queue.Queue):
+        """Run (fn, args) jobs from the given queue one after another (background thread)"""
+        while True:
+            fn, args = jobs.get()
+            try:
+                fn(*args)
+            except Exception:
+                self._log(f"❌ Lỗi tác vụ nền:\n{traceback.format_exc()}")
+            finally:
+                jobs.task_done()
+                
+    def _toast(self, message: str):
+        """Show a short non-modal message at the bottom of the window for 3s"""
+        if self._toast_after_id:
+            self.root.after_cancel(self._toast_after_id)
+        self._toast_label.configure(text=message)
+        self._toast_label.place(relx=0.5, rely=1.0, y=-20, anchor="s")
+        self._toast_label.lift()
+        self._toast_after_id = self.root.after(3000, self._hide_toast)
+        
+    def _hide_toast(self):
+        """Hide the toast label"""
+        self._toast_after_id = None
+        self._toast_label.place_forget()
+        
+    def _warn_inline(self, message: str):
+        """Show a validation warning in exec_status_label for 3s"""
+        if self._warn_after_id:
+            self.root.after_cancel(self._warn_after_id)
+        else:
+            self._warn_restore = (
+                self.exec_status_label.cget("text"),
+                self.exec_status_label.cget("text_color")
+            )
+        self._apply(self.exec_status_label, text=f"⚠ {message}", text_color=WARNING)
+        self._warn_after_id = self.root.after(3000, self._clear_warn)
+        
+    def _clear_warn(self):
+        """Restore exec_status_label after an inline warning"""
+        self._warn_after_id = None
+        text, color = self._warn_restore
+        self._apply(self.exec_status_label, text=text, text_color=color)
+        
+    def _set_ui_mode(self, mode: str):
+        """Apply the precomputed widget options for a run state"""
+        if self._warn_after_id:
+            # The new state replaces any inline warning
+            self.root.after_cancel(self._warn_after_id)
+            self._warn_after_id = None
+        for widget, opts in self._ui_modes[mode]:
+            self._apply(widget, **opts)
+            
+    def _apply(self, widget, **opts):
+        """Configure only the options that differ from the last _apply on this widget"""
+        last = self._last_cfg.setdefault(id(widget), {})
+        changed = {k: v for k, v in opts.items() if last.get(k) != v}
+        if changed:
+            widget.configure(**changed)
+            last.update(changed)
+            
+    def _update_stats(self, values: Dict[str, int]):
+        """Request stat box updates; applied in a batch at most every 250ms"""
+        self._stats.update(values)
+        if not self._stats_scheduled:
+            self._stats_scheduled = True
+            self.root.after(250, self._flush_stats)
+            
+    def _flush_stats(self):
+        """Apply changed stat values to the stat box labels"""
+        self._stats_scheduled = False
+        if TAB_TASKS not in self._built_tabs:
+            return
+            
+        for key, value in self._stats.items():
+            if self._last_stats.get(key) != value:
+                self.stats_widgets[key].configure(text=str(value))
+                self._last_stats[key] = value
+                
+    def _on_close(self):
+        """Stop scheduled callbacks, quit pooled browsers and close the window"""
+        self._alive = False
+        self.is_running = False
+        if self._after_id:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._toast_after_id:
+            self.root.after_cancel(self._toast_after_id)
+            self._toast_after_id = None
+        if self._warn_after_id:
+            self.root.after_cancel(self._warn_after_id)
+            self._warn_after_id = None
+            
+        # Snapshot: the login worker may still be adding browsers
+        for browser in list(self.browser_instances.values()):
+            try:
+                browser.close()
+            except:
+                pass
+        self.browser_instances.clear()
+        self.root.destroy()
+        
     # ==================== Logging ====================
     
     def _log(self, message: str):
         """Thread-safe logging"""
-        import time
-        timestamp = time.strftime("%H:%M:%S")
-        self.log_queue.put(f"[{timestamp}] {message}")
-        
+        # Quiet mode: skip before any formatting, but never hide errors
+        if not self._log_enabled and not message.startswith(LOG_ERROR_PREFIX):
+            return
+            
+        schedule = False
+        repeated = None
+        with self._dup_lock:
+            is_dup = message == self._last_msg
+            if is_dup:
+                self._dup_count += 1
+                if not self._dup_flush_scheduled and self._alive:
+                    self._dup_flush_scheduled = schedule = True
+            else:
+                repeated = self._take_dup_line()
+                self._last_msg = message
+                
+        if is_dup:
+            # Don't hide a message that keeps repeating for long
+            if schedule:
+                self.root.after(500, self._flush_dup)
+            return
+            
+        timestamp = self._timestamp()
+        if repeated:
+            self._enqueue_log(f"[{timestamp}] {repeated}")
+        self._enqueue_log(f"[{timestamp}] {message}")
+        
+    def _timestamp(self) -> str:
+        """Current "%H:%M:%S", formatted at most once per second"""
+        now = time.time()
+        sec = int(now)
+        last_sec, timestamp = self._last_ts
+        if sec != last_sec:
+            timestamp = time.strftime("%H:%M:%S", time.localtime(now))
+            self._last_ts = (sec, timestamp)
+        return timestamp
+        
+    def _take_dup_line(self) -> Optional[str]:
+        """Return the pending repeat line and reset the count (caller holds _dup_lock)"""
+        if not self._dup_count:
+            return None
+        # N counts repeats after the line already shown, syslog-style
+        line = f"{self._last_msg} (lặp lại {self._dup_count} lần)"
+        self._dup_count = 0
+        return line
+        
+    def _flush_dup(self):
+        """Log the pending repeat count of the last message"""
+        with self._dup_lock:
+            self._dup_flush_scheduled = False
+            repeated = self._take_dup_line()
+        if repeated:
+            self._enqueue_log(f"[{self._timestamp()}] {repeated}")
+        
+    def _post_ui_event(self, kind: str, payload):
+        """Thread-safe: queue a (kind, payload) event for _handle_ui_event"""
+        self._enqueue_log((kind, payload))
+        
+    def _enqueue_log(self, item):
+        """Put without blocking; drop the oldest entry when the queue is full"""
+        # SimpleQueue has no maxsize; qsize() is approximate, which is fine for a cap
+        if self.log_queue.qsize() >= LOG_QUEUE_MAXSIZE:
+            try:
+                self.log_queue.get_nowait()
+                self._dropped_logs += 1
+            except queue.Empty:
+                pass
+        self.log_queue.put_nowait(item)
+        self._schedule_log_wakeup()
+        
+    def _schedule_log_wakeup(self):
+        """Ask the Tk thread to drain the log queue soon, at most once per drain"""
+        with self._wakeup_lock:
+            if self._wakeup_scheduled or not self._alive:
+                return
+            self._wakeup_scheduled = True
+            
+        if threading.current_thread() is threading.main_thread():
+            self.root.after_idle(self._drain_log_queue)
+        else:
+            # after_idle is not safe from worker threads in all Tk builds
+            self.root.after(0, self._drain_log_queue)
+            
     def _process_log_queue(self):
-        """Process log messages from queue"""
+        """Heartbeat: drain the log queue in case a wakeup was missed"""
+        self._after_id = None
+        if not self._alive:
+            return
         try:
-            while True:
-                message = self.log_queue.get_nowait()
-                self.progress_text.config(state="normal")
-                self.progress_text.insert("end", message + "\n")
-                self.progress_text.see("end")
-                self.progress_text.config(state="disabled")
-        except queue.Empty:
-            pass
+            self._drain_log_queue()
         finally:
-            self.root.after(100, self._process_log_queue)
+            self._after_id = self.root.after(LOG_HEARTBEAT_MS, self._process_log_queue)
+            
+    def _drain_log_queue(self):
+        """Process log messages from queue"""
+        with self._wakeup_lock:
+            self._wakeup_scheduled = False
+        if not self._alive:
+            return
+            
+        # Drain at most LOG_DRAIN_LIMIT items per call; schedule another pass for the rest
+        messages = []
+        get, append, handle = self.log_queue.get_nowait, messages.append, self._handle_ui_event
+        for _ in range(LOG_DRAIN_LIMIT):
+            try:
+                item = get()
+            except queue.Empty:
+                break
+            if type(item) is tuple:
+                handle(*item)
+            else:
+                append(item)
+        else:
+            self._schedule_log_wakeup()
+            
+        if messages:
+            self._log_buf.extend(messages)
+            # Tab hidden: _on_tab_changed renders the tail when it is shown
+            if self.tabview.get() == TAB_TASKS:
+                self._append_progress_lines(messages)
+            
+    def _handle_ui_event(self, kind: str, payload):
+        """Handle a (kind, payload) event posted to the log queue"""
+        if kind == "progress":
+            self._apply(self.task_count_label, text=f"⏳ Đang load... {payload} rows")
+        elif kind == "loaded":
+            self._on_excel_loaded(payload)
+            
+    def _append_progress_lines(self, messages: List[str]):
+        """Show new log lines in the progress text"""
+        pt = self.progress_text
+        was_at_bottom = pt.yview()[1] >= 0.999
+        if was_at_bottom:
+            # Pinned to the bottom: only the tail is visible, redraw just that
+            self._render_log_tail()
+            return
+            
+        cfg = pt.config
+        cfg(state="normal")
+        pt.insert("end", "\n".join(messages) + "\n")
+        
+        # Keep only the last MAX_LOG_LINES lines
+        line_count = int(pt.index("end-1c").split(".")[0]) - 1
+        if line_count > MAX_LOG_LINES:
+            pt.delete("1.0", f"{line_count - MAX_LOG_LINES + 1}.0")
+            
+        # User scrolled up to read: leave the view where it is
+        cfg(state="disabled")
+        
+    def _render_log_tail(self):
+        """Replace the progress text with the last LOG_VISIBLE_LINES buffered lines"""
+        tail = list(itertools.islice(reversed(self._log_buf), LOG_VISIBLE_LINES))
+        tail.reverse()
+        
+        pt = self.progress_text
+        cfg = pt.config
+        cfg(state="normal")
+        pt.delete("1.0", "end")
+        if tail:
+            pt.insert("end", "\n".join(tail) + "\n")
+        pt.see("end")
+        cfg(state="disabled")
             
     def run(self):
         """Start the application"""
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self._log("🎬 Sora Automation Tool v2.0.0 đã khởi động")
         self.root.mainloop()
 